@@ -0,0 +1,74 @@
+"""
+A tiny dispatch shim that lets the analytic element kernels run on NumPy, PyTorch or JAX arrays.
+
+The kernels are written against an array namespace xp (numpy, torch or jax.numpy), which is picked 
+from the type of the inputs or from an explicit backend name. torch and jax are optional and only 
+imported when requested.
+"""
+import numpy as np
+
+def get_namespace(*arrays, backend=None):
+    """
+    Returns the array namespace to compute with.
+
+    Parameters:
+    - arrays: Inputs of the computation. The first torch.Tensor or jax.Array among them selects its library.
+    - backend (str, optional): 'numpy', 'torch' or 'jax'. Overrides the inputs when given.
+
+    Returns:
+    module: numpy, torch or jax.numpy.
+    """
+    if backend is None:
+        for a in arrays:
+            module = type(a).__module__.split('.')[0]
+            if module == 'torch':
+                backend = 'torch'
+                break
+            if module in ('jax', 'jaxlib'):
+                backend = 'jax'
+                break
+        else:
+            return np
+
+    if backend == 'numpy':
+        return np
+    if backend == 'torch':
+        import torch
+        return torch
+    if backend == 'jax':
+        import jax.numpy as jnp
+        return jnp
+
+    raise ValueError(f"Unknown backend '{backend}', expected 'numpy', 'torch' or 'jax'")
+
+def asarray(xp, x, like=None):
+    """
+    Converts x (a scalar, list or NumPy array) to an array of namespace xp. 
+    
+    If like is given, the result gets its dtype (and, for torch, its device).
+    """
+    if xp is np:
+        return np.asarray(x, dtype=float)
+    if xp.__name__ == 'torch':
+        if isinstance(x, np.ndarray) and not x.flags.writeable:
+            x = x.copy()
+        if like is not None:
+            return xp.as_tensor(x, dtype=like.dtype, device=like.device)
+        return xp.as_tensor(x, dtype=xp.float64)
+    if like is not None:
+        return xp.asarray(x, dtype=like.dtype)
+    return xp.asarray(x)
+
+def broadcast_arrays(xp, *arrays):
+    """
+    Broadcasts the arguments against each other, converting scalars to arrays of namespace xp first.
+    """
+    if xp is np:
+        return np.broadcast_arrays(*arrays)
+
+    like = next((a for a in arrays if get_namespace(a) is xp), None)
+    arrays = [a if get_namespace(a) is xp else asarray(xp, a, like) for a in arrays]
+
+    if xp.__name__ == 'torch':
+        return xp.broadcast_tensors(*arrays)
+    return xp.broadcast_arrays(*arrays)
@@ -0,0 +1,94 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled (Cython) versions of the element kernels.
+
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+The Element class uses this extension when it is available and falls back to numba or NumPy otherwise.
+"""
+
+def element_stiffness_local(double L, double EA, double EI, double[:, ::1] out):
+    """
+    Fills out with the local stiffness matrix of an element combining extension and Euler-Bernoulli bending.
+
+    Parameters:
+    - L (float): Length of the element.
+    - EA (float): The axial stiffness of the element.
+    - EI (float): The flexural stiffness of the element.
+    - out (numpy.ndarray): C-contiguous output buffer, shape (6, 6). Entries that are zero in the
+                           stiffness matrix are set to zero.
+    """
+    cdef Py_ssize_t i, j
+    cdef double ea = EA / L
+    cdef double b1 = 12.0 * EI / L / L / L
+    cdef double b2 = 6.0 * EI / L / L
+    cdef double b3 = 4.0 * EI / L
+    cdef double b4 = 2.0 * EI / L
+
+    for i in range(6):
+        for j in range(6):
+            out[i, j] = 0.0
+
+    # Extension contribution
+
+    out[0, 0] = out[3, 3] = ea
+    out[3, 0] = out[0, 3] = -ea
+
+    # Bending contribution
+
+    out[1, 1] = out[4, 4] = b1
+    out[1, 4] = out[4, 1] = -b1
+    out[1, 2] = out[2, 1] = out[1, 5] = out[5, 1] = -b2
+    out[2, 4] = out[4, 2] = out[4, 5] = out[5, 4] = b2
+    out[2, 2] = out[5, 5] = b3
+    out[2, 5] = out[5, 2] = b4
+
+def bending_moments(double L, double q, double EI, double w_1, double phi_1, double w_2, double phi_2,
+                    const double[::1] x, double[::1] out):
+    """
+    Fills out with the bending moments along an element at the points x.
+
+    Parameters:
+    - L (float): Length of the element.
+    - q (float): Distributed load in local z direction.
+    - EI (float): The flexural stiffness of the element.
+    - w_1, phi_1, w_2, phi_2 (float): Local displacements and rotations of both nodes.
+    - x (numpy.ndarray): Local coordinates to evaluate the bending moment at.
+    - out (numpy.ndarray): Output buffer, same length as x.
+    """
+    cdef Py_ssize_t i
+    cdef double L2 = L * L
+    cdef double L3 = L2 * L
+
+    cdef double a0 = -q * L2 / 12.0 - 2.0 * EI * (2.0 * phi_1 + phi_2) / L + 6.0 * EI * (w_1 - w_2) / L2
+    cdef double a1 = 0.5 * q * L + 6.0 * EI * (phi_1 + phi_2) / L2 - 12.0 * EI * (w_1 - w_2) / L3
+    cdef double a2 = -0.5 * q
+
+    for i in range(x.shape[0]):
+        out[i] = (a2 * x[i] + a1) * x[i] + a0
+
+def full_displacement(double L, double q_x, double q, double EA, double EI,
+                      double u_1, double w_1, double phi_1, double u_2, double w_2, double phi_2,
+                      const double[::1] x, double[::1] u_out, double[::1] w_out):
+    """
+    Fills u_out and w_out with the axial and transverse displacement along an element at the points x.
+
+    Parameters:
+    - L (float): Length of the element.
+    - q_x, q (float): Distributed load in local x and z direction.
+    - EA, EI (float): The axial and flexural stiffness of the element.
+    - u_1, w_1, phi_1, u_2, w_2, phi_2 (float): Local displacements and rotations of both nodes.
+    - x (numpy.ndarray): Local coordinates to evaluate the displacements at.
+    - u_out, w_out (numpy.ndarray): Output buffers, same length as x.
+    """
+    cdef Py_ssize_t i
+    cdef double xi
+
+    for i in range(x.shape[0]):
+        xi = x[i]
+        u_out[i] = q_x*(-L*xi/(2*EA) + xi*xi/(2*EA)) + u_1*(1 - xi/L) + u_2*xi/L
+        w_out[i] = (phi_1*(-xi + 2*xi*xi/L - xi*xi*xi/(L*L)) + phi_2*(xi*xi/L - xi*xi*xi/(L*L))
+                    + q*(L*L*xi*xi/(24*EI) - L*xi*xi*xi/(12*EI) + xi*xi*xi*xi/(24*EI))
+                    + w_1*(1 - 3*xi*xi/(L*L) + 2*xi*xi*xi/(L*L*L)) + w_2*(3*xi*xi/(L*L) - 2*xi*xi*xi/(L*L*L)))
@@ -0,0 +1,87 @@
+"""
+Numba-compiled versions of the analytic element solutions used for postprocessing.
+
+This module requires numba. It is imported lazily by the Element class, which falls back to
+plain NumPy when numba is not installed.
+"""
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, fastmath=True)
+def _bm_kernel(L, q, EI, w_1, phi_1, w_2, phi_2, x, out):
+    """
+    Evaluates the bending moment along an element at the points x.
+
+    Parameters:
+    - L (float): Length of the element.
+    - q (float): Distributed load in local z direction.
+    - EI (float): The flexural stiffness of the element.
+    - w_1, phi_1, w_2, phi_2 (float): Local displacements and rotations of both nodes.
+    - x (numpy.ndarray): Local coordinates to evaluate the bending moment at.
+    - out (numpy.ndarray): Output buffer, same length as x.
+
+    Returns:
+    numpy.ndarray: The buffer out, filled with the bending moments.
+    """
+    L2 = L * L
+    L3 = L2 * L
+
+    a0 = -q * L2 / 12.0 - 2.0 * EI * (2.0 * phi_1 + phi_2) / L + 6.0 * EI * (w_1 - w_2) / L2
+    a1 = 0.5 * q * L + 6.0 * EI * (phi_1 + phi_2) / L2 - 12.0 * EI * (w_1 - w_2) / L3
+    a2 = -0.5 * q
+
+    for i in range(x.shape[0]):
+        out[i] = (a2 * x[i] + a1) * x[i] + a0
+    return out
+
+@njit(cache=True, fastmath=True)
+def _disp_kernel(L, q_x, q, EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2, x, u_out, w_out):
+    """
+    Evaluates the axial and transverse displacement along an element at the points x.
+
+    Parameters:
+    - L (float): Length of the element.
+    - q_x, q (float): Distributed load in local x and z direction.
+    - EA, EI (float): The axial and flexural stiffness of the element.
+    - u_1, w_1, phi_1, u_2, w_2, phi_2 (float): Local displacements and rotations of both nodes.
+    - x (numpy.ndarray): Local coordinates to evaluate the displacements at.
+    - u_out, w_out (numpy.ndarray): Output buffers, same length as x.
+
+    Returns:
+    tuple: The buffers u_out and w_out, filled with the displacements.
+    """
+    for i in range(x.shape[0]):
+        xi = x[i]
+        u_out[i] = q_x*(-L*xi/(2*EA) + xi**2/(2*EA)) + u_1*(1 - xi/L) + u_2*xi/L
+        w_out[i] = (phi_1*(-xi + 2*xi**2/L - xi**3/L**2) + phi_2*(xi**2/L - xi**3/L**2)
+                    + q*(L**2*xi**2/(24*EI) - L*xi**3/(12*EI) + xi**4/(24*EI))
+                    + w_1*(1 - 3*xi**2/L**2 + 2*xi**3/L**3) + w_2*(3*xi**2/L**2 - 2*xi**3/L**3))
+    return u_out, w_out
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _postprocess_kernel(L, EA, EI, q, cos, sin, u_global, M, u, w):
+    """
+    Evaluates bending moments and displacements for many elements in parallel.
+
+    Parameters:
+    - L, EA, EI (numpy.ndarray): Lengths and stiffnesses of the elements, shape (N,).
+    - q (numpy.ndarray): Distributed loads in local x and z direction, shape (N, 2).
+    - cos, sin (numpy.ndarray): Cosines and sines of the orientation angles, shape (N,).
+    - u_global (numpy.ndarray): Global displacement vectors of the elements, shape (N, 6).
+    - M, u, w (numpy.ndarray): Output buffers, shape (N, num_points).
+    """
+    num_points = M.shape[1]
+    for e in prange(L.shape[0]):
+        c = cos[e]
+        s = sin[e]
+
+        local = np.empty(6)
+        for i in (0, 3):
+            local[i]     = c * u_global[e, i] - s * u_global[e, i + 1]
+            local[i + 1] = s * u_global[e, i] + c * u_global[e, i + 1]
+            local[i + 2] = u_global[e, i + 2]
+
+        x = np.linspace(0.0, L[e], num_points)
+        _bm_kernel(L[e], q[e, 1], EI[e], local[1], local[2], local[4], local[5], x, M[e])
+        _disp_kernel(L[e], q[e, 0], q[e, 1], EA[e], EI[e], local[0], local[1], local[2],
+                     local[3], local[4], local[5], x, u[e], w[e])
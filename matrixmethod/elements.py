@@ -1,7 +1,701 @@
+import functools
+import threading
+
 import numpy as np
-import matplotlib.pyplot as plt
 
-class Element:
+from ._backend import get_namespace, asarray, broadcast_arrays
+
+try:
+    from . import _c
+except ImportError:
+    _c = None
+
+__all__ = ['Element', 'ElementStore', 'stiffness_batch', 'coo_all', 'postprocess_all',
+           'plot_moments_all', 'plot_displaced_all']
+
+_numba_kernels = None
+
+def _rotate(v, c, s):
+    """
+    Applies the 2x2 rotation [[c, -s], [s, c]] to the (x, z) components of both nodes of v; 
+    the rotations (moments) are unchanged. Works on a single vector of shape (6,) or on 
+    a stack of shape (N, 6) with c and s of shape (N,). Torch and JAX arrays are supported as well.
+    """
+    if type(v) is np.ndarray and v.ndim == 1 and isinstance(c, float) and isinstance(s, float):
+        u_1, w_1, phi_1, u_2, w_2, phi_2 = v.tolist()
+        return np.array((c * u_1 - s * w_1, s * u_1 + c * w_1, phi_1, c * u_2 - s * w_2, s * u_2 + c * w_2, phi_2))
+
+    xp = get_namespace(v, c, s)
+    if xp is not np:
+        c, s = asarray(xp, c, like=v), asarray(xp, s, like=v)
+        c_v = [v[..., i] for i in range(6)]
+        return xp.stack((c * c_v[0] - s * c_v[1], s * c_v[0] + c * c_v[1], c_v[2],
+                         c * c_v[3] - s * c_v[4], s * c_v[3] + c * c_v[4], c_v[5]), -1)
+
+    c = np.asarray(c, dtype=float)[..., None]
+    s = np.asarray(s, dtype=float)[..., None]
+
+    v = np.array(v, dtype=float)
+    nodes = v.reshape(v.shape[:-1] + (2, 3))
+    x, z = nodes[..., 0].copy(), nodes[..., 1]
+    nodes[..., 0] = c * x - s * z
+    nodes[..., 1] = s * x + c * z
+
+    return v
+
+def _element_vector(u):
+    """
+    Returns the displacement vector u of a single element, e.g. of shape (6,) or (6, 1), with shape (6,).
+    """
+    u = u.reshape(-1) if hasattr(u, 'reshape') else np.ravel(np.asarray(u, dtype=float))
+    if tuple(u.shape) != (6,):
+        raise ValueError(f"Expected the 6 displacements of an element, got {u.shape[0]} values")
+
+    return u
+
+def _rotate_to_local(v, c, s):
+    """
+    Returns T @ v for a global element vector v, without building T.
+    """
+    return _rotate(v, c, s)
+
+def _rotate_to_global(v, c, s):
+    """
+    Returns Tt @ v for a local element vector v, without building Tt.
+    """
+    return _rotate(v, c, -s)
+
+_scratch = threading.local()
+
+# Local stiffness matrix of an element combining extension and Euler-Bernoulli bending, as indices into 
+# the coefficients (0, EA/L, 12EI/L^3, 6EI/L^2, 4EI/L, 2EI/L, -EA/L, -12EI/L^3, -6EI/L^2) of _local_stiffness.
+_STIFFNESS_INDEX = np.array([[1, 0, 0, 6, 0, 0],
+                             [0, 2, 8, 0, 7, 8],
+                             [0, 8, 4, 0, 3, 5],
+                             [6, 0, 0, 1, 0, 0],
+                             [0, 7, 3, 0, 2, 3],
+                             [0, 8, 5, 0, 3, 4]])
+
+def _local_stiffness(EA, EI, L, xp=np):
+    """
+    Returns the local stiffness matrix of one element (for float arguments), shape (6, 6), or of many 
+    elements (for arrays of shape (N,)), shape (N, 6, 6).
+
+    The matrix is gathered from its five distinct coefficients with _STIFFNESS_INDEX, so the same code 
+    serves NumPy, torch and JAX arrays (xp) without in-place assignment.
+    """
+    ea = EA / L
+    b1 = 12.0 * EI / L / L / L
+    b2 = 6.0 * EI / L / L
+    b3 = 4.0 * EI / L
+    b4 = 2.0 * EI / L
+
+    if xp is np and np.ndim(ea) == 0:
+        return np.array((0.0, ea, b1, b2, b3, b4, -ea, -b1, -b2))[_STIFFNESS_INDEX]
+
+    coefficients = xp.stack((ea * 0.0, ea, b1, b2, b3, b4, -ea, -b1, -b2), -1)
+
+    return coefficients[..., _STIFFNESS_INDEX]
+
+def _local_stiffness_buffer():
+    """
+    Returns a per-thread 6x6 scratch buffer for the local stiffness matrix filled by the compiled extension.
+    """
+    if not hasattr(_scratch, 'k'):
+        _scratch.k = np.zeros((6, 6))
+
+    return _scratch.k
+
+@functools.lru_cache(maxsize=1024)
+def _lin(L, n):
+    """
+    Returns np.linspace(0.0, L, n) as a cached, read-only array.
+
+    The cache is bounded, so meshes with many distinct element lengths only keep the most recently used arrays.
+    """
+    x = np.linspace(0.0, L, n)
+    x.setflags(write=False)
+    return x
+
+def _get_kernels():
+    """
+    Returns the numba-compiled kernels module, or None if numba is not installed.
+
+    The import is done on first use, so that numba remains an optional dependency.
+    """
+    global _numba_kernels
+    if _numba_kernels is None:
+        try:
+            from . import _kernels
+            _numba_kernels = _kernels
+        except ImportError:
+            _numba_kernels = False
+
+    return _numba_kernels or None
+
+def _transformation_matrix(c, s):
+    """
+    Returns the 6x6 transformation matrix T of an element with orientation (c, s) = (cos, sin).
+    """
+    T = np.zeros((6, 6))
+
+    T[0, 0] = T[1, 1] = T[3, 3] = T[4, 4] = c
+    T[0, 1] = T[3, 4] = -s
+    T[1, 0] = T[4, 3] = s
+    T[2, 2] = T[5, 5] = 1
+
+    return T
+
+def _transform_buffers():
+    """
+    Returns per-thread scratch buffers (T, Tt @ k) for transforming a single matrix in _transform_6x6.
+
+    The entries of T that do not depend on the orientation are set once; only the rotation entries are overwritten.
+    """
+    if not hasattr(_scratch, 'T'):
+        _scratch.T = np.zeros((6, 6))
+        _scratch.T[2, 2] = _scratch.T[5, 5] = 1
+        _scratch.Ttk = np.empty((6, 6))
+
+    return _scratch.T, _scratch.Ttk
+
+def _transform_6x6(k, c, s, out=None):
+    """
+    Transforms a local element matrix to the global coordinate system, i.e. returns Tt @ k @ T.
+
+    For a single matrix, the two dense 6x6 products are the cheapest: T and the intermediate product are 
+    written into per-thread scratch buffers (see _transform_buffers), so only the result is allocated. 
+    For a stack of matrices, only the rows and columns belonging to the displacements (u, w) are rotated: 
+    T is block diagonal, with a 2x2 rotation R = [[c, -s], [s, c]] acting on (u, w) of each node, while 
+    the rotations phi are not affected. Viewing the stack as a (N, node, dof, node, dof) array, those rows 
+    and columns are plain slices, so they are rotated in place without gathering copies.
+
+    Parameters:
+    - k (numpy.ndarray): Local matrix, shape (6, 6), or a stack of local matrices, shape (N, 6, 6).
+    - c (float or numpy.ndarray): Cosine of the orientation angle, shape () or (N,).
+    - s (float or numpy.ndarray): Sine of the orientation angle, shape () or (N,).
+    - out (numpy.ndarray, optional): C-contiguous buffer with the shape of k to write the result to. 
+                                     May be k itself. Default is a new array.
+
+    Returns:
+    np.ndarray: The transformed matrix (or matrices), same shape as k.
+    """
+    k = np.asarray(k, dtype=float)
+
+    if out is None:
+        out = np.empty(k.shape)
+
+    if k.ndim == 2:
+        T, Ttk = _transform_buffers()
+        T[0, 0] = T[1, 1] = T[3, 3] = T[4, 4] = c
+        T[0, 1] = T[3, 4] = -s
+        T[1, 0] = T[4, 3] = s
+
+        np.matmul(T.T, k, out=Ttk)
+        return np.matmul(Ttk, T, out=out)
+
+    c = np.asarray(c, dtype=float)
+    s = np.asarray(s, dtype=float)
+
+    R = np.empty(c.shape + (1, 2, 2))
+    R[..., 0, 0, 0] = R[..., 0, 1, 1] = c
+    R[..., 0, 0, 1] = -s
+    R[..., 0, 1, 0] = s
+    Rt = np.swapaxes(R, -1, -2)
+
+    lead = k.shape[:-2]
+
+    if out is not k:
+        out[...] = k
+    blocks = out.reshape(lead + (2, 3, 2, 3))
+
+    rows = blocks[..., :, 0:2, :, :].reshape(lead + (2, 2, 6))
+    rows[...] = np.matmul(Rt, rows)
+
+    cols = blocks[..., :, :, :, 0:2].reshape(lead + (6, 2, 2))
+    cols[...] = np.matmul(cols, R)
+
+    return out
+
+def stiffness_batch(L, EA, EI, cos, sin):
+    """
+    Calculate the global stiffness matrices of many elements at once.
+
+    The local stiffness matrices of all elements are gathered in one (N, 6, 6) buffer by 
+    _local_stiffness, after which all coordinate transformations Tt @ k @ T are done
+    in place at once with _transform_6x6.
+
+    When the inputs are torch or JAX arrays, the matrices are built on their device with 
+    the same library instead (see _stiffness_batch_xp).
+
+    Parameters:
+    - L (numpy.ndarray): Lengths of the elements, shape (N,).
+    - EA (numpy.ndarray): Axial stiffnesses of the elements, shape (N,).
+    - EI (numpy.ndarray): Flexural stiffnesses of the elements, shape (N,).
+    - cos (numpy.ndarray): Cosines of the orientation angles of the elements, shape (N,).
+    - sin (numpy.ndarray): Sines of the orientation angles of the elements, shape (N,).
+
+    Returns:
+    np.ndarray: The global stiffness matrices of the elements, shape (N, 6, 6).
+    """
+    xp = get_namespace(L, EA, EI, cos, sin)
+    if xp is not np:
+        return _stiffness_batch_xp(xp, L, EA, EI, cos, sin)
+
+    L  = np.asarray(L, dtype=float)
+    EA = np.asarray(EA, dtype=float)
+    EI = np.asarray(EI, dtype=float)
+
+    k = _local_stiffness(EA, EI, L)
+
+    return _transform_6x6(k, cos, sin, out=k)
+
+
+def _stiffness_batch_xp(xp, L, EA, EI, cos, sin):
+    """
+    stiffness_batch for torch or JAX arrays, written without in-place assignment (which JAX does not allow).
+
+    The local matrices k are gathered by _local_stiffness, the transformation matrices T are stacked from 
+    their entries, and Tt @ k @ T is computed with batched matrix products, so on a GPU the whole batch runs as strided batched GEMMs.
+    """
+    like = next(a for a in (L, EA, EI, cos, sin) if get_namespace(a) is xp)
+    L, EA, EI, c, s = (asarray(xp, a, like) for a in (L, EA, EI, cos, sin))
+
+    k = _local_stiffness(EA, EI, L, xp)
+
+    o  = xp.zeros_like(L)
+    i  = xp.ones_like(L)
+
+    T = xp.stack([xp.stack(row, -1) for row in (( c, -s,  o,  o,  o,  o),
+                                                 ( s,  c,  o,  o,  o,  o),
+                                                 ( o,  o,  i,  o,  o,  o),
+                                                 ( o,  o,  o,  c, -s,  o),
+                                                 ( o,  o,  o,  s,  c,  o),
+                                                 ( o,  o,  o,  o,  o,  i))], -2)
+
+    return xp.matmul(xp.swapaxes(T, -1, -2), xp.matmul(k, T))
+
+@functools.lru_cache(maxsize=None)
+def _basis(n):
+    """
+    Returns the (read-only) polynomial basis [1, xi, xi^2, xi^3, xi^4] evaluated at n equally
+    spaced points xi = x / L in [0, 1], shape (n, 5). It is shared by all elements.
+    """
+    xi = np.linspace(0.0, 1.0, n)
+    B = np.stack([np.ones(n), xi, xi**2, xi**3, xi**4], axis=1)
+    B.setflags(write=False)
+    return B
+
+def _evaluate(coefficients, num_points):
+    """
+    Evaluates polynomial coefficients of shape (..., 5) at the points of _basis(num_points).
+
+    All polynomials are evaluated with one matrix product, written straight into the result array
+    of shape (..., num_points), so no temporaries are allocated for the product.
+    """
+    coefficients = np.ascontiguousarray(coefficients, dtype=float)
+    out = np.empty(coefficients.shape[:-1] + (num_points,))
+
+    np.matmul(coefficients.reshape(-1, 5), _basis(num_points).T, out=out.reshape(-1, num_points))
+
+    return out
+
+def _moment_coefficients(L, q, EI, w_1, phi_1, w_2, phi_2):
+    """
+    Returns the coefficients of the analytic bending moment solution as a polynomial in xi = x / L.
+
+    All arguments broadcast: scalars give a single row of shape (5,), arrays of shape (N,) give
+    one row per element, shape (N, 5). The moments follow as coefficients @ _basis(num_points).T.
+    """
+    L2 = L * L
+
+    a0 = -q * L2 / 12.0 - 2.0 * EI * (2.0 * phi_1 + phi_2) / L + 6.0 * EI * (w_1 - w_2) / L2
+    a1 = 0.5 * q * L2 + 6.0 * EI * (phi_1 + phi_2) / L - 12.0 * EI * (w_1 - w_2) / L2
+    a2 = -0.5 * q * L2
+
+    xp = get_namespace(a0, a1, a2)
+    a0, a1, a2 = broadcast_arrays(xp, a0, a1, a2)
+    zero = xp.zeros_like(a0)
+
+    return xp.stack((a0, a1, a2, zero, zero), -1)
+
+def _displacement_coefficients(L, q_x, q, EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2):
+    """
+    Returns the coefficients of the analytic axial (u) and transverse (w) displacement solutions 
+    as polynomials in xi = x / L. Broadcasts like _moment_coefficients.
+    """
+    L4 = L**4
+
+    c_u = (u_1,
+           -q_x * L * L / (2 * EA) - u_1 + u_2,
+           q_x * L * L / (2 * EA),
+           0.0,
+           0.0)
+
+    c_w = (w_1,
+           -phi_1 * L,
+           (2 * phi_1 + phi_2) * L + q * L4 / (24 * EI) - 3 * w_1 + 3 * w_2,
+           -(phi_1 + phi_2) * L - q * L4 / (12 * EI) + 2 * w_1 - 2 * w_2,
+           q * L4 / (24 * EI))
+
+    xp = get_namespace(*c_u, *c_w)
+    c = broadcast_arrays(xp, *c_u, *c_w)
+
+    return xp.stack(c[:5], -1), xp.stack(c[5:], -1)
+
+_FIELDS = {'X0': ('x0',), 'Z0': ('z0',), 'X1': ('x1',), 'Z1': ('z1',), 'L': ('L',), 'EA': ('EA',), 'EI': ('EI',),
+           'q': ('q',), 'cos': ('cs', 0), 'sin': ('cs', 1)}
+
+def _gather(elements, *names):
+    """
+    Collects the given attributes of a list of elements into NumPy arrays, one array per attribute.
+
+    When all elements are views into the same ElementStore, the fields are read from the store directly
+    (as a slice when the elements are consecutive records, as after build_batch).
+    """
+    store = getattr(elements[0], '_store', None) if len(elements) else None
+
+    if store is None or any(getattr(elem, '_store', None) is not store for elem in elements):
+        return tuple(np.array([getattr(elem, name) for elem in elements], dtype=float) for name in names)
+
+    index = np.fromiter((elem._i for elem in elements), dtype=np.intp, count=len(elements))
+    if np.array_equal(index, np.arange(index[0], index[0] + len(index))):
+        records = store._data[index[0]:index[0] + len(index)]
+    else:
+        records = store._data[index]
+
+    fields = []
+    for name in names:
+        field, *column = _FIELDS[name]
+        values = records[field]
+        if column:
+            values = values[:, column[0]]
+        if name in ('EA', 'EI') and np.isnan(values).any():
+            raise AttributeError(f"{name} of an element is not set, call set_section first")
+        fields.append(values)
+
+    return tuple(fields)
+
+def coo_all(elements):
+    """
+    Returns the stiffness contributions of many elements in COO (triplet) form.
+
+    The global stiffness matrices of all elements are computed at once with stiffness_batch, so 
+    a sparse global stiffness matrix can be built with a single call, e.g. scipy.sparse.coo_matrix((data, (rows, cols))).
+
+    Parameters:
+    - elements (list): List of Element objects.
+
+    Returns:
+    - rows (numpy.ndarray): Row indices (global DOFs), shape (36 * N,).
+    - cols (numpy.ndarray): Column indices (global DOFs), shape (36 * N,).
+    - data (numpy.ndarray): Stiffness values, shape (36 * N,).
+    """
+    L, EA, EI, cos, sin = _gather(elements, 'L', 'EA', 'EI', 'cos', 'sin')
+    dofs = np.array([elem.global_dofs() for elem in elements], dtype=np.intp).reshape(-1, 6)
+
+    K = stiffness_batch(L, EA, EI, cos, sin)
+
+    rows = np.repeat(dofs, 6, axis=1).ravel()
+    cols = np.tile(dofs, 6).ravel()
+
+    return rows, cols, K.ravel()
+
+def postprocess_all(elements, u_global_all, num_points=2):
+    """
+    Calculates the bending moments and displacements along many elements at once.
+
+    When numba is available, the elements are processed in parallel (numba.prange); the number 
+    of threads follows numba.set_num_threads. Otherwise the analytic solutions are evaluated 
+    for all elements at once: the polynomial coefficients of all three fields are multiplied 
+    with one shared basis matrix in a single matrix product (see _basis and _evaluate).
+
+    Parameters:
+    - elements (list): List of Element objects.
+    - u_global_all (numpy.ndarray): Global displacement vectors of the elements, shape (N, 6).
+    - num_points (int): Number of points to evaluate the fields at. Default is 2.
+
+    Returns:
+    - M (numpy.ndarray): Bending moments, shape (N, num_points).
+    - u (numpy.ndarray): Axial displacements, shape (N, num_points).
+    - w (numpy.ndarray): Transverse displacements, shape (N, num_points).
+    """
+    L, EA, EI, q, cos, sin = _gather(elements, 'L', 'EA', 'EI', 'q', 'cos', 'sin')
+    q = q.reshape(-1, 2)
+    u_global_all = np.asarray(u_global_all, dtype=float).reshape(-1, 6)
+
+    kernels = _get_kernels()
+    if kernels is not None:
+        N = len(L)
+        M, u, w = np.empty((N, num_points)), np.empty((N, num_points)), np.empty((N, num_points))
+        kernels._postprocess_kernel(L, EA, EI, q, cos, sin, u_global_all, M, u, w)
+        return M, u, w
+
+    ul = _rotate_to_local(u_global_all, cos, sin)
+    u_1, w_1, phi_1, u_2, w_2, phi_2 = ul.T
+
+    c_M = _moment_coefficients(L, q[:, 1], EI, w_1, phi_1, w_2, phi_2)
+    c_u, c_w = _displacement_coefficients(L, q[:, 0], q[:, 1], EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2)
+
+    M, u, w = _evaluate(np.stack((c_M, c_u, c_w)), num_points)
+
+    return M, u, w
+
+
+def _setup_axes(ax, title=None, global_c=False):
+    """
+    Applies the common axes settings of the plot functions: inverted z axis (pointing downwards), 
+    transparent background and, for plots in global coordinates, equal scaling without axes.
+    """
+    if global_c:
+        ax.axis('off')
+        ax.axis('equal')
+    if not ax.yaxis_inverted():
+        ax.invert_yaxis()
+    ax.figure.patch.set_alpha(0.0)
+    ax.patch.set_alpha(0.0)
+    if title is not None:
+        ax.set_title(title)
+
+def _next_colors(ax, n):
+    """
+    Returns the next n colors of the color cycle of the given axes.
+
+    Each color is taken from an empty line, which is removed again. The axes thereby advance their own 
+    cycle (including ax.set_prop_cycle), exactly as one plt.plot call per element would.
+    """
+    colors = []
+    for _ in range(n):
+        line, = ax.plot([], [])
+        colors.append(line.get_color())
+        line.remove()
+
+    return colors
+
+def _to_global_lines(elements, xz_local):
+    """
+    Rotates local (x, z) polylines of shape (N, num_points, 2) to the global coordinate system 
+    and moves them to the first node of each element.
+    """
+    cos, sin, X0, Z0 = _gather(elements, 'cos', 'sin', 'X0', 'Z0')
+    cos, sin = cos[:, None], sin[:, None]
+
+    X = cos * xz_local[:, :, 0] + sin * xz_local[:, :, 1] + X0[:, None]
+    Z = -sin * xz_local[:, :, 0] + cos * xz_local[:, :, 1] + Z0[:, None]
+
+    return np.stack((X, Z), axis=-1)
+
+def _member_lines(elements):
+    """
+    Returns the undeformed elements as straight lines in global coordinates, shape (N, 2, 2).
+    """
+    X0, Z0, X1, Z1 = _gather(elements, 'X0', 'Z0', 'X1', 'Z1')
+
+    return np.stack((np.stack((X0, Z0), axis=-1), np.stack((X1, Z1), axis=-1)), axis=1)
+
+def plot_moments_all(elements, u_all, ax=None, num_points=10, global_c=False, scale=1.0):
+    """
+    Plots the bending moment diagrams of many elements with a single LineCollection.
+
+    Parameters:
+    - elements (list): List of Element objects.
+    - u_all (numpy.ndarray): Global displacement vectors of the elements, shape (N, 6).
+    - ax (matplotlib.axes.Axes, optional): Axes to plot in. Default is the current axes.
+    - num_points (int, optional): Number of points to calculate the bending moments. Default is 10.
+    - global_c (bool, optional): If True, plots the diagrams in the global coordinate system. Default is False.
+    - scale (float, optional): Scale factor for the bending moment diagrams. Default is 1.0.
+
+    Returns:
+    None
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    if ax is None:
+        ax = plt.gca()
+
+    M, _, _ = postprocess_all(elements, u_all, num_points)
+
+    L, = _gather(elements, 'L')
+    N = len(L)
+    x = np.linspace(0.0, 1.0, num_points) * L[:, None]
+    zeros = np.zeros((N, 1))
+
+    xM_local = np.stack((np.hstack((zeros, x, L[:, None])), np.hstack((zeros, M * scale, zeros))), axis=-1)
+    colors = _next_colors(ax, N)
+
+    if global_c:
+        ax.add_collection(LineCollection(_to_global_lines(elements, xM_local), colors=colors))
+        ax.add_collection(LineCollection(_member_lines(elements), colors=colors))
+    else:
+        ax.add_collection(LineCollection(xM_local, colors=colors))
+        ax.set_xlabel("x")
+        ax.set_ylabel("M")
+
+    ax.autoscale_view()
+    _setup_axes(ax, 'Moment line', global_c)
+
+def plot_displaced_all(elements, u_all, ax=None, num_points=10, global_c=False, scale=1.0):
+    """
+    Plots the displaced shape of many elements with a single LineCollection.
+
+    Parameters:
+    - elements (list): List of Element objects.
+    - u_all (numpy.ndarray): Global displacement vectors of the elements, shape (N, 6).
+    - ax (matplotlib.axes.Axes, optional): Axes to plot in. Default is the current axes.
+    - num_points (int, optional): Number of points to calculate the displacements. Default is 10.
+    - global_c (bool, optional): If True, plots the displaced shapes in the global coordinate system. Default is False.
+    - scale (float, optional): Scale factor for the displacements. Default is 1.0.
+
+    Returns:
+    None
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    if ax is None:
+        ax = plt.gca()
+
+    _, u, w = postprocess_all(elements, u_all, num_points)
+
+    L, = _gather(elements, 'L')
+    N = len(L)
+    x = np.linspace(0.0, 1.0, num_points) * L[:, None]
+
+    uw_local = np.stack((x + u * scale, w * scale), axis=-1)
+    colors = _next_colors(ax, N)
+
+    if global_c:
+        ax.add_collection(LineCollection(_to_global_lines(elements, uw_local), colors=colors))
+        ax.add_collection(LineCollection(_member_lines(elements), colors=colors, alpha=0.3))
+    else:
+        ax.add_collection(LineCollection(uw_local, colors=colors))
+        members = np.zeros((N, 2, 2))
+        members[:, 1, 0] = L
+        ax.add_collection(LineCollection(members, colors=colors, alpha=0.3))
+
+    ax.autoscale_view()
+    _setup_axes(ax, 'Displaced structure', global_c)
+
+
+class ElementStore:
+    """
+    The ElementStore class keeps the properties of many elements in one contiguous NumPy structured array,
+    with one record per element. Element objects are lightweight views into a store: each element only 
+    remembers its store and its row index. Vectorized code reads whole fields at once, e.g. store['L'] or store['cs'].
+
+    Elements created without an explicit store are appended to a shared default store, which grows as needed.
+
+    Attributes:
+        dtype (numpy.dtype): The record layout, with fields
+                             - 'x0', 'z0', 'x1', 'z1': coordinates of the first and second node.
+                             - 'L': length of the element.
+                             - 'EA', 'EI': axial and flexural stiffness (NaN until set_section is called).
+                             - 'cs': cosine and sine of the orientation angle.
+                             - 'q': distributed load in local x and z direction.
+        count (int): The number of elements in the store.
+
+    Adding elements and setting their properties is thread-safe.
+
+    Methods:
+        add(x0, z0, x1, z1): Appends elements and computes their geometry.
+    """
+
+    dtype = np.dtype([('x0', 'f8'), ('z0', 'f8'), ('x1', 'f8'), ('z1', 'f8'),
+                      ('L', 'f8'), ('EA', 'f8'), ('EI', 'f8'), ('cs', 'f8', 2), ('q', 'f8', 2)])
+
+    def __init__(self, N=0):
+        """
+        Initializes an empty ElementStore.
+
+        Parameters:
+        - N (int, optional): Number of elements to allocate room for. The store grows when more are added. Default is 0.
+        """
+        self._data = np.zeros(max(N, 1), dtype=ElementStore.dtype)
+        self.count = 0
+
+        self._lock = threading.Lock()
+
+    def add(self, x0, z0, x1, z1):
+        """
+        Appends elements to the store and computes their geometry in one vectorized pass.
+
+        Reserving the rows, growing the array and writing the new records is done under the lock of the store,
+        so elements can be created from several threads at once.
+
+        Parameters:
+        - x0, z0 (array_like): Coordinates of the first node of each element.
+        - x1, z1 (array_like): Coordinates of the second node of each element.
+
+        Returns:
+        int: The row index of the first added element; the others follow consecutively.
+        """
+        x0 = np.asarray(x0, dtype=float)
+        n = len(x0)
+
+        with self._lock:
+            start = self.count
+            if start + n > len(self._data):
+                data = np.zeros(max(2 * len(self._data), start + n), dtype=ElementStore.dtype)
+                data[:start] = self._data[:start]
+                self._data = data
+
+            rows = self._data[start:start + n]
+
+            rows['x0'] = x0
+            rows['z0'] = z0
+            rows['x1'] = x1
+            rows['z1'] = z1
+
+            dx = rows['x1'] - rows['x0']
+            dz = rows['z1'] - rows['z0']
+
+            rows['L'] = np.hypot(dx, dz)
+            rows['cs'][:, 0] = dx / rows['L']
+            rows['cs'][:, 1] = -dz / rows['L']
+
+            rows['EA'] = np.nan
+            rows['EI'] = np.nan
+            rows['q'] = 0.0
+
+            self.count += n
+
+        return start
+
+    def __getitem__(self, name):
+        """
+        Returns the field name (e.g. 'L', 'EA', 'cs') of all elements in the store.
+        """
+        return self._data[name][:self.count]
+
+    def __len__(self):
+        return self.count
+
+_default_store = ElementStore()
+
+
+class _ElementMeta(type):
+    """
+    Metaclass of Element, providing the attribute Element.ne on the class. Element reuses the 
+    same property, so that it also works on instances.
+    """
+
+    @property
+    def ne(cls):
+        """
+        The number of elements in the default ElementStore. Setting it to 0 (the idiom Element.ne = 0)
+        is the same as Element.clear(); other values are rejected.
+        """
+        return len(_default_store)
+
+    @ne.setter
+    def ne(cls, value):
+        if value != 0:
+            raise ValueError("Element.ne counts the elements in the default ElementStore and can only be reset to 0")
+        Element.clear()
+
+
+class Element(metaclass=_ElementMeta):
     """
     The Element class keeps track of each element in the model, including cross-section properties, 
     element orientation (for coordinate system transformations), and the nodes that make up each element. 
@@ -23,35 +717,44 @@ class Element:
     Methods:
         clear(): Clears the counting of elements.
         __init__(self, nodes): Initializes an Element object.
+        build_batch(node_pairs, store=None): Creates many elements at once.
         set_section(self, props): Sets the section properties of the element.
         global_dofs(self): Returns the global degrees of freedom associated with the element.
-        stiffness(self): Calculate the stiffness matrix of the element.
+        stiffness(self, backend=None): Calculate the stiffness matrix of the element.
+        coo_contribution(self): Returns the stiffness contribution of the element in COO form.
+        assemble_global(elements, ndof): Assembles the sparse global stiffness matrix of a structure.
         add_distributed_load(self, q): Adds a distributed load to the element.
         bending_moments(self, u_global, num_points=2): Calculate the bending moments along the element.
         full_displacement(self, u_global, num_points=2): Calculates the displacement along the element.
-        plot_moment_diagram(self, u_elem, num_points=10, global_c=False, scale=1.0): Plots the bending moment diagram of the element.
-        plot_displaced(self, u_elem, num_points=10, global_c=False, scale=1.0): Plots the displaced element.
+        plot_moment_diagram(self, u_elem, num_points=10, global_c=False, scale=1.0, ax=None): Plots the bending moment diagram of the element.
+        plot_displaced(self, u_elem, num_points=10, global_c=False, scale=1.0, ax=None): Plots the displaced element.
         __str__(self): Returns a string representation of the Element object.
     """
 
-    ne = 0
-
     def clear():
         """
         Clears the counting of elements
 
-        This method resets the class-level counters for number of elements. 
+        This method replaces the default ElementStore by a new, empty one, which also resets the number 
+        of elements Element.ne. Elements created before keep their own data in the old store.
         It should be used when you want to start a new problem from scratch.
         """
-        Element.ne = 0
+        global _default_store
+        _default_store = ElementStore()
         
-    def __init__(self, node1, node2):
+    ne = _ElementMeta.ne
+
+    def __init__(self, node1, node2, store=None):
         """
         Initializes an Element object.
 
+        The properties of the element are stored as a record in an ElementStore. Use Element.build_batch
+        to create many elements at once.
+
         Parameters:
         - node1 (Node): The first node of the element.
         - node2 (Node): The second node of the element.
+        - store (ElementStore, optional): The store to add the element to. Default is the shared default store.
 
         Attributes:
         - nodes (list): A list of Node objects representing the nodes of the element.
@@ -64,25 +767,147 @@ class Element:
         Returns:
         None
         """
+        if store is None:
+            store = _default_store
+
+        i = store.add([node1.x], [node1.z], [node2.x], [node2.z])
+        self._attach(node1, node2, store, i)
+
+    @classmethod
+    def build_batch(cls, node_pairs, store=None):
+        """
+        Creates many elements at once.
+
+        The lengths and orientations of all elements are computed in a single vectorized pass and 
+        stored as consecutive records of an ElementStore. The returned elements are thin views into 
+        that store and behave exactly like elements created one by one.
+
+        Parameters:
+        - node_pairs (list): A list of (node1, node2) tuples, one for each element.
+        - store (ElementStore, optional): The store to add the elements to. Default is the shared default store.
+
+        Returns:
+        list: A list of Element objects, in the same order as node_pairs.
+        """
+        node_pairs = list(node_pairs)
+
+        if store is None:
+            store = _default_store
+
+        start = store.add([pair[0].x for pair in node_pairs], [pair[0].z for pair in node_pairs],
+                          [pair[1].x for pair in node_pairs], [pair[1].z for pair in node_pairs])
+
+        elements = []
+        for i, (node1, node2) in enumerate(node_pairs):
+            elem = cls.__new__(cls)
+            elem._attach(node1, node2, store, start + i)
+            elements.append(elem)
+
+        return elements
+
+    def _attach(self, node1, node2, store, i):
+        """
+        Links the element to its nodes and to row i of the given ElementStore.
+        """
         self.nodes = [node1, node2]
+        self._store = store
+        self._i = i
 
-        self.L = np.sqrt((self.nodes[1].x - self.nodes[0].x)**2.0 + (self.nodes[1].z - self.nodes[0].z)**2.0)
+        self.local_element_load = np.zeros(6)
 
-        alpha = np.arctan2( - (self.nodes[1].z - self.nodes[0].z) , (self.nodes[1].x - self.nodes[0].x))
+        self._K_global = None
+        self._dofs = None
 
-        T = np.zeros((6, 6))
+    @property
+    def X0(self):
+        """x-coordinate of the first node."""
+        return self._store._data['x0'][self._i]
 
-        T[0, 0] = T[1, 1] = T[3, 3] = T[4, 4] = np.cos(alpha)
-        T[0, 1] = T[3, 4] = -np.sin(alpha)
-        T[1, 0] = T[4, 3] = np.sin(alpha)
-        T[2, 2] = T[5, 5] = 1
-        self.T = T
-        self.Tt = np.transpose(T)
+    @property
+    def Z0(self):
+        """z-coordinate of the first node."""
+        return self._store._data['z0'][self._i]
 
-        self.q = np.array([0,0])
-        self.local_element_load = np.array([0,0,0,0,0,0])
-        
-        Element.ne += 1
+    @property
+    def X1(self):
+        """x-coordinate of the second node."""
+        return self._store._data['x1'][self._i]
+
+    @property
+    def Z1(self):
+        """z-coordinate of the second node."""
+        return self._store._data['z1'][self._i]
+
+    @property
+    def L(self):
+        """Length of the element."""
+        return self._store._data['L'][self._i]
+
+    @property
+    def cos(self):
+        """Cosine of the element's orientation angle."""
+        return self._store._data['cs'][self._i, 0]
+
+    @property
+    def sin(self):
+        """Sine of the element's orientation angle."""
+        return self._store._data['cs'][self._i, 1]
+
+    def _cs(self):
+        """Returns (cos, sin) of the element as Python floats, for the single-element fast paths."""
+        return self._store._data['cs'][self._i].tolist()
+
+    @property
+    def T(self):
+        """Transformation matrix of the element. Built from cos and sin on each access; it is not stored."""
+        return _transformation_matrix(self.cos, self.sin)
+
+    @property
+    def Tt(self):
+        """Transpose of the transformation matrix of the element."""
+        return self.T.T
+
+    def _section(self, name):
+        """
+        Returns the section property name ('EA' or 'EI'), which is stored as NaN until set_section is called.
+        """
+        value = self._store._data[name][self._i]
+        if value != value:
+            raise AttributeError(f"{name} of the element is not set, call set_section first")
+
+        return value
+
+    @property
+    def EA(self):
+        """The axial stiffness of the element."""
+        return self._section('EA')
+
+    @EA.setter
+    def EA(self, value):
+        with self._store._lock:
+            self._store._data['EA'][self._i] = value
+        self._K_global = None
+
+    @property
+    def EI(self):
+        """The flexural stiffness of the element."""
+        return self._section('EI')
+
+    @EI.setter
+    def EI(self, value):
+        with self._store._lock:
+            self._store._data['EI'][self._i] = value
+        self._K_global = None
+
+    @property
+    def q(self):
+        """Distributed load in local x and z direction."""
+        return self._store._data['q'][self._i]
+
+    @q.setter
+    def q(self, value):
+        with self._store._lock:
+            self._store._data['q'][self._i] = value
 
     def set_section(self, props):
         """
@@ -110,39 +935,81 @@ class Element:
         """
         Returns the global degrees of freedom associated with the element.
 
+        The array is built on the first call and reused afterwards; the DOFs of a node are fixed 
+        when the node is created.
+
         Returns:
-            numpy.ndarray: Array containing the global degrees of freedom.
+            numpy.ndarray: (Read-only) array containing the global degrees of freedom.
         """
-        return np.hstack((self.nodes[0].dofs, self.nodes[1].dofs))
+        if self._dofs is None:
+            self._dofs = np.concatenate([self.nodes[0].dofs, self.nodes[1].dofs]).astype(np.intp, copy=False)
+            self._dofs.setflags(write=False)
+
+        return self._dofs
 
-    def stiffness(self):
+    def stiffness(self, backend=None):
         """
         Calculate the stiffness matrix of the element.
 
+        The local stiffness matrix is filled by the compiled extension matrixmethod._c when it is 
+        available, and otherwise gathered from its coefficients by _local_stiffness. 
+        The result is cached in the element until set_section is called again.
+
+        Parameters:
+        - backend (str, optional): 'torch' or 'jax' to get the matrix as a torch.Tensor or jax.Array
+                                   (not cached). Default is NumPy.
+
         Returns:
-        np.ndarray: The stiffness matrix of the element.
+        np.ndarray: The (read-only) stiffness matrix of the element.
         """
-        k = np.zeros((6, 6))
+        if backend not in (None, 'numpy'):
+            xp = get_namespace(backend=backend)
+            return stiffness_batch(*(asarray(xp, [v]) for v in (self.L, self.EA, self.EI, self.cos, self.sin)))[0]
 
-        EA = self.EA
-        EI = self.EI
-        L = self.L
+        if self._K_global is None:
+            if _c is not None:
+                k = _local_stiffness_buffer()
+                _c.element_stiffness_local(self.L, self.EA, self.EI, k)
+            else:
+                k = _local_stiffness(float(self.EA), float(self.EI), float(self.L))
+            self._K_global = _transform_6x6(k, *self._cs())
+            self._K_global.setflags(write=False)
 
-        # Extension contribution
+        return self._K_global
 
-        k[0, 0] = k[3, 3] = EA / L
-        k[3, 0] = k[0, 3] = -EA / L
+    def coo_contribution(self):
+        """
+        Returns the stiffness contribution of the element in COO (triplet) form.
+
+        Returns:
+        - rows (numpy.ndarray): Row indices (global DOFs), shape (36,).
+        - cols (numpy.ndarray): Column indices (global DOFs), shape (36,).
+        - data (numpy.ndarray): Stiffness values, shape (36,).
+        """
+        dofs = self.global_dofs()
+
+        return np.repeat(dofs, 6), np.tile(dofs, 6), self.stiffness().ravel()
 
-        # Bending contribution
+    @classmethod
+    def assemble_global(cls, elements, ndof):
+        """
+        Assembles the global stiffness matrix of a structure as a sparse matrix.
+
+        All element contributions are collected with coo_all and handed to SciPy in one call;
+        duplicate entries (DOFs shared by several elements) are summed.
 
-        k[1, 1] = k[4, 4] = 12.0 * EI / L / L / L
-        k[1, 4] = k[4, 1] = -12.0 * EI / L / L / L
-        k[1, 2] = k[2, 1] = k[1, 5] = k[5, 1] = -6.0 * EI / L / L
-        k[2, 4] = k[4, 2] = k[4, 5] = k[5, 4] = 6.0 * EI / L / L
-        k[2, 2] = k[5, 5] = 4.0 * EI / L
-        k[2, 5] = k[5, 2] = 2.0 * EI / L
+        Parameters:
+        - elements (list): List of Element objects.
+        - ndof (int): Total number of degrees of freedom (e.g. Node.ndof).
 
-        return np.matmul(np.matmul(self.Tt, k), self.T)
+        Returns:
+        scipy.sparse.csr_matrix: The global stiffness matrix, shape (ndof, ndof).
+        """
+        import scipy.sparse as sp
+
+        rows, cols, data = coo_all(elements)
+
+        return sp.coo_matrix((data, (rows, cols)), shape=(ndof, ndof)).tocsr()
 
     def add_distributed_load(self, q):
         """
@@ -155,12 +1022,17 @@ class Element:
             None
         """
 
-        l = self.L
-        self.q = np.array(q)
+        l = float(self.L)
+        self.q = q
 
-        self.local_element_load = [0.5 * q[0] * l, 0.5 * q[1] * l, -1.0 / 12.0 * q[1] * l * l, 0.5 * q[0] * l, 0.5 * q[1] * l, 1.0 / 12.0 * q[1] * l * l]
+        load = self.local_element_load
+        load[0::3] = 0.5 * q[0] * l
+        load[1::3] = 0.5 * q[1] * l
+        load[2] = -1.0 / 12.0 * q[1] * l * l
+        load[5] = -load[2]
 
-        global_element_load = np.matmul(self.Tt, np.array(self.local_element_load))
+        c, s = self._cs()
+        global_element_load = _rotate_to_global(load, c, s)
 
         self.nodes[0].add_load(global_element_load[0:3])
         self.nodes[1].add_load(global_element_load[3:6])
@@ -170,53 +1042,69 @@ class Element:
         Calculate the bending moments along the element.
 
         Parameters:
-        - u_global (numpy.ndarray): Global displacement vector.
+        - u_global (numpy.ndarray): Global displacement vector. A torch.Tensor or jax.Array is 
+                                    supported as well; the result is then of the same type.
         - num_points (int): Number of points to evaluate the bending moments. Default is 2.
 
         Returns:
         - M (numpy.ndarray): Array of bending moments at the specified points.
         """
 
+        return self._bending_moments_from_local(_rotate_to_local(_element_vector(u_global), *self._cs()), num_points)
+
+    def _bending_moments_from_local(self, local_disp, num_points):
+        """
+        Calculate the bending moments along the element from the local displacement vector.
+        """
         l = self.L
         q = self.q[1]
         EI = self.EI
 
-        local_x = np.linspace(0.0, l, num_points)
-
-        local_disp = np.matmul(self.T, u_global)
-
         w_1 = local_disp[1]
         phi_1 = local_disp[2]
         w_2 = local_disp[4]
         phi_2 = local_disp[5]
 
-        M = (-l ** 5.0 * q + 6.0 * l ** 4.0 * q * local_x
-             - 6.0 * q * local_x * local_x * l ** 3.0 - 48.0 * (phi_1 + phi_2 / 2.0) * EI * l ** 2.0
-             + 72.0 * EI * ((phi_1 + phi_2) * local_x + w_1 - w_2) * l - 144.0 * local_x * EI * (w_1 - w_2)) / 12.0 / l ** 3.0
-        
-        return M
+        xp = get_namespace(local_disp)
+        if xp is not np:
+            coefficients = _moment_coefficients(float(l), float(q), float(EI), w_1, phi_1, w_2, phi_2)
+            return xp.matmul(coefficients, asarray(xp, _basis(num_points), like=coefficients).T)
+
+        if _c is not None:
+            M = np.empty(num_points)
+            _c.bending_moments(l, q, EI, w_1, phi_1, w_2, phi_2, _lin(float(l), num_points), M)
+            return M
+
+        kernels = _get_kernels()
+        if kernels is not None:
+            return kernels._bm_kernel(l, q, EI, w_1, phi_1, w_2, phi_2, _lin(float(l), num_points), np.empty(num_points))
+
+        return np.matmul(_moment_coefficients(l, q, EI, w_1, phi_1, w_2, phi_2), _basis(num_points).T)
     
     def full_displacement (self, u_global, num_points=2):
         """
         Calculates the displacement along the element.
 
         Args:
-            u_global (numpy.ndarray): Global displacement vector of the element.
+            u_global (numpy.ndarray): Global displacement vector of the element. A torch.Tensor or jax.Array
+                                      is supported as well; the result is then of the same type.
             num_points (int, optional): Number of points to calculate the bending moments. Default is 2.
 
         Returns:
             numpy.ndarray: Array of displacement along the element.
         """
+        return self._full_displacement_from_local(_rotate_to_local(_element_vector(u_global), *self._cs()), num_points)
+
+    def _full_displacement_from_local(self, ul, num_points):
+        """
+        Calculates the displacement along the element from the local displacement vector.
+        """
         L = self.L
         q = self.q[1]
         q_x = self.q[0]
         EI= self.EI
         EA = self.EA
 
-        x = np.linspace ( 0.0, L, num_points )
-
-        ul = np.matmul ( self.T, u_global )
-
         u_1   = ul[0]
         w_1   = ul[1]
         phi_1 = ul[2]
@@ -224,12 +1112,29 @@ class Element:
         w_2   = ul[4]
         phi_2 = ul[5]
 
-        u = q_x*(-L*x/(2*EA) + x**2/(2*EA)) + u_1*(1 - x/L) + u_2*x/L
-        w = phi_1*(-x + 2*x**2/L - x**3/L**2) + phi_2*(x**2/L - x**3/L**2) + q*(L**2*x**2/(24*EI) - L*x**3/(12*EI) + x**4/(24*EI)) + w_1*(1 - 3*x**2/L**2 + 2*x**3/L**3) + w_2*(3*x**2/L**2 - 2*x**3/L**3)
-        
-        return u, w
+        xp = get_namespace(ul)
+        if xp is not np:
+            c_u, c_w = _displacement_coefficients(float(L), float(q_x), float(q), float(EA), float(EI),
+                                                  u_1, w_1, phi_1, u_2, w_2, phi_2)
+            B = asarray(xp, _basis(num_points), like=c_w).T
+            return xp.matmul(c_u, B), xp.matmul(c_w, B)
+
+        if _c is not None:
+            u, w = np.empty(num_points), np.empty(num_points)
+            _c.full_displacement(L, q_x, q, EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2, _lin(float(L), num_points), u, w)
+            return u, w
+
+        kernels = _get_kernels()
+        if kernels is not None:
+            return kernels._disp_kernel(L, q_x, q, EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2, _lin(float(L), num_points),
+                                        np.empty(num_points), np.empty(num_points))
+
+        c_u, c_w = _displacement_coefficients(L, q_x, q, EA, EI, u_1, w_1, phi_1, u_2, w_2, phi_2)
+        B = _basis(num_points)
+
+        return np.matmul(c_u, B.T), np.matmul(c_w, B.T)
     
-    def plot_moment_diagram (self, u_elem, num_points=10, global_c=False, scale=1.0):
+    def plot_moment_diagram (self, u_elem, num_points=10, global_c=False, scale=1.0, ax=None):
         """
         Plots the bending moment diagram of the element.
 
@@ -238,39 +1143,14 @@ class Element:
             num_points (int, optional): Number of points to calculate the bending moments. Default is 2.
             global_c (bool, optional): If True, plots the bending moment diagram in the global coordinate system. Default is False (plots in local coordinate system).
             scale (float, optional): Scale factor for the bending moment diagram. Default is 1.0.
+            ax (matplotlib.axes.Axes, optional): Axes to plot in. Default is the current axes.
 
         Returns:
             None
         """
-        import matplotlib.pyplot as plt
+        plot_moments_all([self], [u_elem], ax=ax, num_points=num_points, global_c=global_c, scale=scale)
 
-        x = np.linspace ( 0.0, self.L, num_points )
-        M = self.bending_moments ( u_elem, num_points )
-        xM_local = np.vstack((np.hstack([0,x,x[-1]]),np.hstack([0,M,0])*scale))
-        if global_c:
-            xM_global = np.matmul(self.Tt[0:2,:2],xM_local)
-            xz_start_node = np.vstack((np.ones(num_points+2)*self.nodes[0].x, np.ones(num_points+2)*self.nodes[0].z))
-            xz_Mlijn = xM_global + xz_start_node
-            p = plt.plot(xz_Mlijn[0,:],xz_Mlijn[1,:])
-            X0= self.nodes[0].x
-            Z0= self.nodes[0].z
-            X1= self.nodes[1].x
-            Z1= self.nodes[1].z
-            plt.plot((X0, X1), (Z0, Z1), color=p[0].get_color())
-            plt.axis('off')
-            plt.axis('equal')
-        else:
-            p = plt.plot(xM_local[0,:],xM_local[1,:])
-            plt.xlabel ( "x" )
-            plt.ylabel ( "M" )
-        if not plt.gca().yaxis_inverted():
-            plt.gca().invert_yaxis()
-        plt.gcf().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
-        plt.title('Moment line')
-
-    def plot_displaced(self, u_elem, num_points=10, global_c=False, scale=1.0):
+    def plot_displaced(self, u_elem, num_points=10, global_c=False, scale=1.0, ax=None):
         """
         Plots the displacd element.
 
@@ -279,35 +1159,12 @@ class Element:
             num_points (int, optional): Number of points to calculate the bending moments. Default is 2.
             global_c (bool, optional): If True, plots the displacement diagram in the global coordinate system. Default is False (plots in local coordinate system).
             scale (float, optional): Scale factor for the displacement diagram. Default is 1.0.
+            ax (matplotlib.axes.Axes, optional): Axes to plot in. Default is the current axes.
 
         Returns:
             None
         """
-
-        x = np.linspace ( 0.0, self.L, num_points )
-        u, w = self.full_displacement ( u_elem, num_points )
-        uw_local = np.vstack((x+u*scale,w*scale))
-        if global_c:
-            uw_global = np.matmul(self.Tt[:2,:2],uw_local)
-            xz_start_node = np.vstack((np.ones(num_points)*self.nodes[0].x, np.ones(num_points)*self.nodes[0].z))
-            uw = uw_global + xz_start_node
-            p =  plt.plot(uw[0,:],uw[1,:])
-            X0= self.nodes[0].x
-            Z0= self.nodes[0].z
-            X1= self.nodes[1].x
-            Z1= self.nodes[1].z
-            plt.plot((X0, X1), (Z0, Z1), color=p[0].get_color(),alpha=0.3)
-            plt.axis('off')
-            plt.axis('equal')
-        else:
-            p = plt.plot(uw_local[0,:],uw_local[1,:])
-            plt.plot((0, self.L), (0, 0), color=p[0].get_color(),alpha=0.3)
-        if not plt.gca().yaxis_inverted():
-            plt.gca().invert_yaxis()
-        plt.gcf().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
-        plt.title('Displaced structure')
+        plot_displaced_all([self], [u_elem], ax=ax, num_points=num_points, global_c=global_c, scale=scale)
 
     def plot_numbered_structure(self,beam_number):
         """
@@ -316,6 +1173,7 @@ class Element:
         Returns:
             None
         """
+        import matplotlib.pyplot as plt
 
         X0= self.nodes[0].x
         Z0= self.nodes[0].z
@@ -328,13 +1186,7 @@ class Element:
         for i, node in enumerate(self.nodes):
             plt.text(node.x, node.z, f'[{node.dofs[0] // 3}]', fontsize=12, ha='center', va='center')
         plt.text((X0+X1)/2, (Z0+Z1)/2, f'({beam_number})', fontsize=12, ha='center', va='center')
-        if not plt.gca().yaxis_inverted():
-            plt.gca().invert_yaxis()
-        plt.axis('off')
-        plt.axis('equal')
-        plt.gcf().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
-        plt.gca().patch.set_alpha(0.0)
+        _setup_axes(plt.gca(), global_c=True)
 
 
     def __str__(self):
@@ -0,0 +1,34 @@
+"""
+Builds the optional compiled extension matrixmethod._c in place:
+
+    python setup.py build_ext --inplace
+
+The .pyx source is translated by Cython, which setuptools picks up automatically when it is installed.
+The package works without the extension; the Element class then falls back to numba (if installed) or NumPy.
+If Cython or a C compiler is missing, or the build fails, the package is installed without it.
+
+By default the extension is compiled portably. Set MATRIXMETHOD_NATIVE=1 to optimize it for the
+building machine (-march=native -ffast-math); such a build should not be shared with other machines.
+"""
+import os
+
+from setuptools import setup, Extension
+
+extra_compile_args = ["-O3"]
+if os.environ.get("MATRIXMETHOD_NATIVE") == "1":
+    extra_compile_args += ["-march=native", "-ffast-math"]
+
+extensions = [
+    Extension(
+        "matrixmethod._c",
+        ["matrixmethod/_c.pyx"],
+        extra_compile_args=extra_compile_args,
+        optional=True,
+    )
+]
+
+setup(
+    name="matrixmethod",
+    packages=["matrixmethod"],
+    ext_modules=extensions,
+)
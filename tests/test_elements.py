@@ -0,0 +1,258 @@
+import threading
+
+import numpy as np
+import pytest
+
+import matrixmethod as mm
+from matrixmethod import elements
+
+
+@pytest.fixture(params=['numpy', 'numba', 'cython'])
+def backend(request, monkeypatch):
+    """Runs a test once for every kernel implementation: the NumPy basis path, numba and the Cython extension."""
+    if request.param == 'numpy':
+        monkeypatch.setattr(elements, '_c', None)
+        monkeypatch.setattr(elements, '_numba_kernels', False)
+    elif request.param == 'numba':
+        pytest.importorskip('numba')
+        monkeypatch.setattr(elements, '_c', None)
+        monkeypatch.setattr(elements, '_numba_kernels', None)
+    elif elements._c is None:
+        pytest.skip('the Cython extension matrixmethod._c is not built')
+
+    return request.param
+
+
+def _old_T(elem):
+    """The transformation matrix as built by the original implementation."""
+    alpha = np.arctan2(-(elem.nodes[1].z - elem.nodes[0].z), elem.nodes[1].x - elem.nodes[0].x)
+
+    T = np.zeros((6, 6))
+    T[0, 0] = T[1, 1] = T[3, 3] = T[4, 4] = np.cos(alpha)
+    T[0, 1] = T[3, 4] = -np.sin(alpha)
+    T[1, 0] = T[4, 3] = np.sin(alpha)
+    T[2, 2] = T[5, 5] = 1
+
+    return T
+
+
+def _old_stiffness(elem):
+    """The global stiffness matrix as computed by the original implementation."""
+    EA, EI, L = elem.EA, elem.EI, elem.L
+    k = np.zeros((6, 6))
+
+    k[0, 0] = k[3, 3] = EA / L
+    k[3, 0] = k[0, 3] = -EA / L
+    k[1, 1] = k[4, 4] = 12.0 * EI / L / L / L
+    k[1, 4] = k[4, 1] = -12.0 * EI / L / L / L
+    k[1, 2] = k[2, 1] = k[1, 5] = k[5, 1] = -6.0 * EI / L / L
+    k[2, 4] = k[4, 2] = k[4, 5] = k[5, 4] = 6.0 * EI / L / L
+    k[2, 2] = k[5, 5] = 4.0 * EI / L
+    k[2, 5] = k[5, 2] = 2.0 * EI / L
+
+    T = _old_T(elem)
+    return np.matmul(np.matmul(T.T, k), T)
+
+
+def _old_bending_moments(elem, u_global, num_points):
+    """The bending moment expression of the original implementation, before the Horner form."""
+    l, q, EI = elem.L, elem.q[1], elem.EI
+    local_x = np.linspace(0.0, l, num_points)
+    _, w_1, phi_1, _, w_2, phi_2 = np.matmul(_old_T(elem), u_global)
+
+    return (-l ** 5.0 * q + 6.0 * l ** 4.0 * q * local_x
+            - 6.0 * q * local_x * local_x * l ** 3.0 - 48.0 * (phi_1 + phi_2 / 2.0) * EI * l ** 2.0
+            + 72.0 * EI * ((phi_1 + phi_2) * local_x + w_1 - w_2) * l - 144.0 * local_x * EI * (w_1 - w_2)) / 12.0 / l ** 3.0
+
+
+def _old_full_displacement(elem, u_global, num_points):
+    """The displacement expressions of the original implementation."""
+    L, q_x, q, EA, EI = elem.L, elem.q[0], elem.q[1], elem.EA, elem.EI
+    x = np.linspace(0.0, L, num_points)
+    u_1, w_1, phi_1, u_2, w_2, phi_2 = np.matmul(_old_T(elem), u_global)
+
+    u = q_x*(-L*x/(2*EA) + x**2/(2*EA)) + u_1*(1 - x/L) + u_2*x/L
+    w = phi_1*(-x + 2*x**2/L - x**3/L**2) + phi_2*(x**2/L - x**3/L**2) + q*(L**2*x**2/(24*EI) - L*x**3/(12*EI) + x**4/(24*EI)) + w_1*(1 - 3*x**2/L**2 + 2*x**3/L**3) + w_2*(3*x**2/L**2 - 2*x**3/L**3)
+
+    return u, w
+
+
+def _random_structure(rng, n):
+    """Creates a chain of n elements in random directions with random properties and distributed loads."""
+    mm.Node.clear()
+    mm.Element.clear()
+
+    nodes = [mm.Node(x, z) for x, z in rng.normal(scale=3.0, size=(n + 1, 2))]
+
+    elements = []
+    for node1, node2 in zip(nodes[:-1], nodes[1:]):
+        elem = mm.Element(node1, node2)
+        elem.set_section({'EA': rng.uniform(1.0, 1.e3), 'EI': rng.uniform(1.0, 1.e3)})
+        elem.add_distributed_load([rng.normal(), rng.normal()])
+        elements.append(elem)
+
+    return nodes, elements
+
+
+def _assert_close(actual, expected):
+    expected = np.asarray(expected)
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9 * np.abs(expected).max())
+
+
+def test_bending_moments_match_old_formula(backend):
+    rng = np.random.default_rng(0)
+    _, elements = _random_structure(rng, 100)
+
+    for elem in elements:
+        u = rng.normal(size=6)
+        num_points = int(rng.integers(2, 12))
+
+        _assert_close(elem.bending_moments(u, num_points), _old_bending_moments(elem, u, num_points))
+
+
+def test_full_displacement_matches_old_formula(backend):
+    rng = np.random.default_rng(1)
+    _, elements = _random_structure(rng, 100)
+
+    for elem in elements:
+        u = rng.normal(size=6)
+        num_points = int(rng.integers(2, 12))
+
+        u_new, w_new = elem.full_displacement(u, num_points)
+        u_old, w_old = _old_full_displacement(elem, u, num_points)
+
+        _assert_close(u_new, u_old)
+        _assert_close(w_new, w_old)
+
+
+def test_postprocess_all_matches_old_formula(backend):
+    rng = np.random.default_rng(2)
+    _, elements = _random_structure(rng, 100)
+    u_all = rng.normal(size=(100, 6))
+
+    M, u, w = mm.postprocess_all(elements, u_all, 7)
+
+    for i, elem in enumerate(elements):
+        u_old, w_old = _old_full_displacement(elem, u_all[i], 7)
+
+        _assert_close(M[i], _old_bending_moments(elem, u_all[i], 7))
+        _assert_close(u[i], u_old)
+        _assert_close(w[i], w_old)
+
+
+def test_column_vector_displacements():
+    rng = np.random.default_rng(3)
+    _, elements = _random_structure(rng, 1)
+    elem, u = elements[0], rng.normal(size=6)
+
+    _assert_close(elem.bending_moments(u.reshape(6, 1), 5), elem.bending_moments(u, 5))
+    _assert_close(elem.full_displacement(u.reshape(6, 1), 5), elem.full_displacement(u, 5))
+
+    with pytest.raises(ValueError):
+        elem.bending_moments(np.ones(5))
+
+
+def test_stiffness_matches_old_formula_and_batch(backend):
+    rng = np.random.default_rng(4)
+    _, elements = _random_structure(rng, 50)
+
+    L, EA, EI, cos, sin = (np.array([getattr(elem, name) for elem in elements]) for name in ('L', 'EA', 'EI', 'cos', 'sin'))
+    K_batch = mm.stiffness_batch(L, EA, EI, cos, sin)
+
+    for elem, K in zip(elements, K_batch):
+        _assert_close(elem.stiffness(), _old_stiffness(elem))
+        _assert_close(elem.stiffness(), K)
+
+
+def test_stiffness_requires_section():
+    mm.Node.clear()
+    mm.Element.clear()
+    elem = mm.Element(mm.Node(0.0, 0.0), mm.Node(1.0, 1.0))
+
+    with pytest.raises(AttributeError):
+        elem.stiffness()
+
+
+def test_assemble_global_matches_dense_assembly():
+    rng = np.random.default_rng(5)
+    _, elements = _random_structure(rng, 30)
+
+    K = np.zeros((mm.Node.ndof, mm.Node.ndof))
+    for elem in elements:
+        dofs = elem.global_dofs()
+        K[np.ix_(dofs, dofs)] += _old_stiffness(elem)
+
+    _assert_close(mm.Element.assemble_global(elements, mm.Node.ndof).toarray(), K)
+
+
+def test_distributed_load_matches_old_formula():
+    rng = np.random.default_rng(6)
+    nodes, elements = _random_structure(rng, 30)
+
+    p = np.zeros((len(nodes), 3))
+    for i, elem in enumerate(elements):
+        q, l = elem.q, elem.L
+        f = np.array([0.5 * q[0] * l, 0.5 * q[1] * l, -1.0 / 12.0 * q[1] * l * l, 0.5 * q[0] * l, 0.5 * q[1] * l, 1.0 / 12.0 * q[1] * l * l])
+        p[i:i + 2] += np.matmul(_old_T(elem).T, f).reshape(2, 3)
+
+    for node, p_node in zip(nodes, p):
+        _assert_close(node.p, p_node)
+
+
+def test_clear_keeps_existing_elements():
+    mm.Node.clear()
+    mm.Element.clear()
+    old = mm.Element(mm.Node(0.0, 0.0), mm.Node(1.0, 0.0))
+    old.set_section({'EA': 1.0, 'EI': 2.0})
+
+    mm.Element.clear()
+    assert mm.Element.ne == 0
+
+    new = mm.Element(mm.Node(0.0, 0.0), mm.Node(5.0, 5.0))
+    new.set_section({'EA': 7.0})
+
+    assert mm.Element.ne == 1
+    assert old.L == 1.0 and old.EA == 1.0 and old.EI == 2.0
+
+
+def test_store_growth_keeps_records():
+    store = mm.ElementStore(1)
+    mm.Node.clear()
+    nodes = [mm.Node(float(i), float(i * i)) for i in range(40)]
+
+    created = [mm.Element(node1, node2, store=store) for node1, node2 in zip(nodes[:5], nodes[1:6])]
+    created += mm.Element.build_batch(zip(nodes[5:-1], nodes[6:]), store=store)
+    for i, elem in enumerate(created):
+        elem.set_section({'EA': float(i), 'EI': 1.0})
+
+    assert len(store) == 39
+    np.testing.assert_allclose(store['L'], [np.hypot(1.0, 2 * i + 1) for i in range(39)])
+    np.testing.assert_array_equal(store['EA'], np.arange(39.0))
+    assert [elem.L for elem in created] == list(store['L'])
+
+
+def test_elements_can_be_created_from_several_threads():
+    mm.Node.clear()
+    mm.Element.clear()
+    nodes = [mm.Node(float(i), 0.5 * i * i) for i in range(4001)]
+    created = [[] for _ in range(8)]
+
+    def create(t):
+        for i in range(t, 4000, 8):
+            elem = mm.Element(nodes[i], nodes[i + 1])
+            elem.set_section({'EA': float(i)})
+            created[t].append((i, elem))
+
+    threads = [threading.Thread(target=create, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elements = [pair for pairs in created for pair in pairs]
+
+    assert mm.Element.ne == 4000
+    assert len({elem._i for _, elem in elements}) == 4000
+    for i, elem in elements:
+        assert elem.EA == i
+        assert np.isclose(elem.L, np.hypot(1.0, 0.5 * (2 * i + 1)))